@@ -0,0 +1,41 @@
+import functools
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def cached_parquet(func):
+    """
+    Decorator that persists a DataFrame-returning function's result as a Parquet file.
+
+    The wrapped function gains two keyword arguments:
+
+    cache_path : str or Path, optional
+        Where to store the result. If the file exists it is read back instead of calling
+        the function; if it does not, the function runs and its result is written there
+        (Zstd-compressed). None (default) disables caching.
+    force : bool
+        Recompute and overwrite the cache even if it exists.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, cache_path=None, force=False, **kwargs):
+        if cache_path is None:
+            return func(*args, **kwargs)
+
+        path = Path(cache_path)
+        if path.exists() and not force:
+            logging.info(f"Loading cached result of {func.__name__} from {path}")
+            return pd.read_parquet(path, engine="pyarrow")
+
+        result = func(*args, **kwargs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        result.to_parquet(path, engine="pyarrow", compression="zstd")
+        logging.info(f"Cached result of {func.__name__} to {path}")
+        return result
+
+    return wrapper
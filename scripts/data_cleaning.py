@@ -1,7 +1,13 @@
 import pandas as pd
 import numpy as np
 import logging
-from sklearn.preprocessing import MinMaxScaler
+from joblib import Parallel, delayed
+from scripts.preprocessing import classify_columns, downcast, min_max_scale, optimize_dtypes
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
 
 
 # Configure logging
@@ -19,11 +25,12 @@ class DataCleaner:
         """
         self.input_path = input_path
         self.output_path = output_path
-        self.scaler = MinMaxScaler()
 
     def load_data(self, file_name):
         """
-        Loads a dataset from the input directory.
+        Loads a dataset from the input directory. CSV files are parsed with the
+        multi-threaded PyArrow engine; Parquet files are read directly. Dtypes are
+        narrowed with `optimize_dtypes`, the same as in `EDA.load_data`.
 
         Args:
             file_name (str): Name of the file to load.
@@ -33,8 +40,12 @@ class DataCleaner:
         """
         file_path = f"{self.input_path}/{file_name}"
         logging.info(f"Loading data from {file_path}")
-        data = pd.read_csv(file_path)
+        if file_name.endswith(".parquet"):
+            data = pd.read_parquet(file_path, engine="pyarrow")
+        else:
+            data = pd.read_csv(file_path, engine="pyarrow")
         logging.info(f"Successfully loaded data with shape {data.shape}")
+        data = optimize_dtypes(data)
         return data
 
     def save_data(self, data, file_name):
@@ -49,6 +60,18 @@ class DataCleaner:
         logging.info(f"Saving cleaned data to {file_path}")
         data.to_csv(file_path, index=False)
 
+    def save_parquet(self, data, file_name):
+        """
+        Saves the dataset to the output directory as a Zstd-compressed Parquet file.
+
+        Args:
+            data (pd.DataFrame): Dataset to save.
+            file_name (str): Name of the output file (e.g. "Fraud_Data_with_Geolocation.parquet").
+        """
+        file_path = f"{self.output_path}/{file_name}"
+        logging.info(f"Saving cleaned data to {file_path}")
+        data.to_parquet(file_path, engine="pyarrow", compression="zstd", index=False)
+
     def convert_data_types(self, data, columns, dtype="datetime"):
         """
         Converts the specified columns to the desired data type.
@@ -73,48 +96,82 @@ class DataCleaner:
                 logging.info(f"Converted column {col} to float format.")
         return data
     
-    def remove_duplicates(self, data):
+    def remove_duplicates(self, data, subset=None):
         """
         Removes duplicate rows from the dataset.
 
         Args:
             data (pd.DataFrame): Dataset.
+            subset (list): Key columns that identify a duplicate (e.g. ["user_id", "purchase_time"]).
+                Hashing only the keys is much cheaper than hashing every cell; None compares full rows.
 
         Returns:
             pd.DataFrame: Dataset with duplicate rows removed.
         """
         initial_shape = data.shape
-        data.drop_duplicates(inplace=True)
+        data.drop_duplicates(subset=subset, keep="first", inplace=True, ignore_index=True)
         logging.info(f"Removed {initial_shape[0] - data.shape[0]} duplicate rows.")
         return data
 
-    def handle_outliers(self, df, column_method, threshold=1.5):
+    def _compute_bounds(self, arr, threshold=1.5):
+        """
+        Computes the IQR outlier bounds of a column.
+
+        Args:
+            arr (np.ndarray): Column values.
+            threshold (float): IQR multiplier.
+
+        Returns:
+            tuple: Lower and upper bounds.
+        """
+        Q1, Q3 = np.nanpercentile(arr, [25, 75])
+        IQR = Q3 - Q1
+        return Q1 - threshold * IQR, Q3 + threshold * IQR
+
+    def handle_outliers(self, df, column_method, threshold=1.5, z_threshold=3):
         """
         Handles outliers in a column using capping, flooring, or log transformation.
 
         Args:
-            data (pd.DataFrame): Dataset.
-            column_methos list(str,str): Column name and method to handle outliers ("iqr","log").
+            df (pd.DataFrame): Dataset.
+            column_method (list[tuple[str, str]]): (column name, method) pairs; method is one of
+                "iqr", "cap", "zscore", "zscore_cap" or "log".
             threshold (float): Threshold for IQR method (used for capping).
+            z_threshold (float): Number of standard deviations for the Z-score methods.
+
+        Returns:
+            pd.DataFrame: Dataset with outliers removed, capped or transformed.
         """
+        # Row filters are accumulated here and applied in a single gather after the loop
+        keep = np.ones(len(df), dtype=bool)
 
         for col,method in column_method:
-            if method == "iqr":
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - threshold * IQR
-                upper_bound = Q3 + threshold * IQR
-                df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
-                logging.info(f"Removed outliers in {col} using IQR method.")
+            if method in ("iqr", "cap"):
+                arr = df[col].to_numpy(dtype=float)
+                lower_bound, upper_bound = self._compute_bounds(arr, threshold)
+                if method == "iqr":
+                    keep &= (arr >= lower_bound) & (arr <= upper_bound)
+                    logging.info(f"Removed outliers in {col} using IQR method.")
+                else:
+                    df[col] = np.clip(arr, lower_bound, upper_bound)
+                    logging.info(f"Capped outliers in {col} to [{lower_bound}, {upper_bound}].")
             elif method == "zscore":
-                from scipy.stats import zscore
-                df = df[(zscore(df[col]) < 3).all(axis=1)]
+                arr = df[col].to_numpy(dtype=float)
+                mean, std = np.nanmean(arr), np.nanstd(arr)
+                keep &= np.abs(arr - mean) <= z_threshold * std
                 logging.info(f"Removed outliers in {col} using Z-score method.")
+            elif method == "zscore_cap":
+                arr = df[col].to_numpy(dtype=float)
+                mean, std = np.nanmean(arr), np.nanstd(arr)
+                df[col] = np.clip(arr, mean - z_threshold * std, mean + z_threshold * std)
+                logging.info(f"Capped outliers in {col} to {z_threshold} standard deviations.")
             elif method == "log":
-                df[col] = df[col].apply(lambda x: np.log1p(x) if x > 0 else 0)
+                arr = df[col].to_numpy(dtype=float)
+                df[col] = np.log1p(arr, out=np.zeros_like(arr), where=arr > 0)
                 logging.info(f"Applied log transformation to {col}.")
 
+        if not keep.all():
+            df = df.loc[keep]
         return df
 
     def normalize_columns(self, data, columns):
@@ -125,11 +182,11 @@ class DataCleaner:
             data (pd.DataFrame): Dataset.
             columns (list): List of column names to normalize.
         """
-        data[columns] = self.scaler.fit_transform(data[columns])
+        data = min_max_scale(data, columns)
         logging.info(f"Normalized columns: {columns}.")
         return data
 
-    def encode_categorical(self, data, drop_first=True, cardinality_threshold=50):
+    def encode_categorical(self, data, drop_first=True, cardinality_threshold=50, as_sparse=False):
         """
         Encodes categorical columns using one-hot encoding.
 
@@ -137,19 +194,47 @@ class DataCleaner:
             data (pd.DataFrame): Dataset.
             drop_first (bool): Whether to drop the first category to avoid multicollinearity.
             cardinality_threshold (int): Maximum unique values allowed for one-hot encoding.
+            as_sparse (bool): Return the indicators as a single uint8 CSR matrix instead of
+                dense DataFrame columns.
+
+        Returns:
+            pd.DataFrame, or (pd.DataFrame, scipy.sparse.csr_matrix, np.ndarray) when as_sparse
+            is True: the remaining columns, the encoded matrix and its feature names.
         """
-        categorical_cols = [
-            col for col in data.select_dtypes(include="object").columns
-            if not pd.api.types.is_datetime64_any_dtype(data[col])
-        ]
+        categorical_cols = classify_columns(data)["categorical"]
 
-        for col in categorical_cols:
-            unique_values = data[col].nunique()
+        nuniques = data[categorical_cols].nunique()
+        eligible = []
+        for col, unique_values in nuniques.items():
             if unique_values <= cardinality_threshold:
                 logging.info(f"Encoding column {col} with {unique_values} unique values.")
-                data = pd.get_dummies(data, columns=[col], drop_first=drop_first)
+                eligible.append(col)
+                if isinstance(data[col].dtype, pd.CategoricalDtype):
+                    # Rows may have been filtered since load; avoid all-zero dummy columns
+                    data[col] = data[col].cat.remove_unused_categories()
             else:
                 logging.warning(f"Skipping column {col} with {unique_values} unique values (high cardinality).")
+
+        if as_sparse:
+            from scipy import sparse
+            from sklearn.preprocessing import OneHotEncoder
+
+            if not eligible:
+                return data, sparse.csr_matrix((len(data), 0), dtype=np.uint8), np.array([], dtype=object)
+
+            encoder = OneHotEncoder(
+                sparse_output=True,
+                dtype=np.uint8,
+                drop="first" if drop_first else None,
+                handle_unknown="ignore",
+            )
+            encoded = encoder.fit_transform(data[eligible]).tocsr()
+            return data.drop(columns=eligible), encoded, encoder.get_feature_names_out(eligible)
+
+        if eligible:
+            # Keep wide indicator blocks sparse; uint8 dummies are 8x smaller than float64
+            sparse = nuniques[eligible].mean() > 20
+            data = pd.get_dummies(data, columns=eligible, drop_first=drop_first, sparse=sparse, dtype=np.uint8)
         return data
 
     def create_features(self, data):
@@ -160,13 +245,32 @@ class DataCleaner:
             data (pd.DataFrame): Dataset.
         """
         if "signup_time" in data.columns and "purchase_time" in data.columns:
-            data["time_since_signup"] = (
-                pd.to_datetime(data["purchase_time"]) - pd.to_datetime(data["signup_time"])
-            ).dt.total_seconds() / 3600
+            for col in ("signup_time", "purchase_time"):
+                if not pd.api.types.is_datetime64_any_dtype(data[col]):
+                    data[col] = pd.to_datetime(data[col], format="ISO8601", cache=True)
+
+            # Subtract the int64 nanosecond views directly (ns -> hours), keeping NaT as NaN
+            purchase = data["purchase_time"].to_numpy(dtype="datetime64[ns]")
+            signup = data["signup_time"].to_numpy(dtype="datetime64[ns]")
+            purchase_ns, signup_ns = purchase.view("i8"), signup.view("i8")
+            if ne is not None:
+                # Fused, multi-threaded evaluation without an intermediate difference array
+                hours = ne.evaluate("(purchase_ns - signup_ns) / 3.6e12")
+            else:
+                hours = (purchase_ns - signup_ns) / 3.6e12
+            hours[np.isnat(purchase) | np.isnat(signup)] = np.nan
+            data["time_since_signup"] = hours
             logging.info("Created 'time_since_signup' feature.")
 
         if "Time" in data.columns:
-            data["hour_of_day"] = (data["Time"] % (3600 * 24)) // 3600
+            t = data["Time"].to_numpy(dtype=float)
+            missing = ~np.isfinite(t)
+            # int64 seconds so large offsets do not wrap; missing rows stay <NA>
+            seconds = np.floor(np.where(missing, 0, t)).astype(np.int64)
+            hour_of_day = ((seconds // 3600) % 24).astype(np.int8)
+            if missing.any():
+                hour_of_day = pd.arrays.IntegerArray(hour_of_day, missing)
+            data["hour_of_day"] = hour_of_day
             logging.info("Created 'hour_of_day' feature from 'Time'.")
         return data
 
@@ -183,10 +287,20 @@ class DataCleaner:
         Returns:
         - pd.DataFrame: Cleaned dataset.
         """
+        data = downcast(data)
+
+        # Percentiles dominate the cost and release the GIL, so compute bounds on threads
+        arrays = [data[col].to_numpy(dtype=float) for col in outlier_columns]
+        bounds = Parallel(n_jobs=-1, prefer="threads")(
+            delayed(self._compute_bounds)(arr) for arr in arrays
+        )
+        for col, (lower_bound, upper_bound) in zip(outlier_columns, bounds):
+            if pd.api.types.is_integer_dtype(data[col]):
+                # Integer bounds keep the downcast dtype instead of upcasting to float64
+                lower_bound, upper_bound = int(np.ceil(lower_bound)), int(np.floor(upper_bound))
+            data[col] = data[col].clip(lower_bound, upper_bound)
+            logging.info(f"Capped outliers in {col} to [{lower_bound}, {upper_bound}].")
 
-        for col in outlier_columns:
-            data = self.handle_outliers(data, column=col, method="cap")
-        
         data = self.normalize_columns(data, columns=normalize_columns)
         data = self.encode_categorical(data)
         return data
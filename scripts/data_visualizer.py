@@ -1,6 +1,7 @@
 import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
+import numpy as np
 import logging
 
 # Configure logging
@@ -13,7 +14,7 @@ class DataVisualizer:
     """
 
     @staticmethod
-    def plot_numerical_distribution(data, numerical_columns, title_prefix=""):
+    def plot_numerical_distribution(data, numerical_columns, title_prefix="", kde=False, sample=None):
         """
         Plots the distribution of numerical features in the dataset.
 
@@ -25,16 +26,28 @@ class DataVisualizer:
             List of numerical column names to plot.
         title_prefix : str
             Prefix to append to the plot title.
+        kde : bool
+            Whether to overlay a kernel density estimate (expensive on large datasets).
+        sample : int, optional
+            Number of rows to randomly sample before plotting; None plots every row.
         """
         num_plots = len(numerical_columns)
         num_cols = 2
         num_rows = (num_plots + 1) // num_cols
 
+        plot_data = data[numerical_columns]
+        if sample is not None and sample < len(plot_data):
+            plot_data = plot_data.sample(n=sample, random_state=0)
+
         fig, axes = plt.subplots(num_rows, num_cols, figsize=(16, 4 * num_rows))
         axes = axes.flatten()
+        colors = sns.color_palette('viridis', num_plots)
 
         for i, feature in enumerate(numerical_columns):
-            sns.histplot(data[feature], kde=True, bins=30, ax=axes[i], color=sns.color_palette('viridis', num_plots)[i])
+            if kde:
+                sns.histplot(plot_data[feature], kde=True, bins=30, ax=axes[i], color=colors[i])
+            else:
+                axes[i].hist(plot_data[feature].dropna().to_numpy(), bins=30, color=colors[i])
             axes[i].set_title(f'{title_prefix}Distribution of {feature}')
             axes[i].set_xlabel(feature)
             axes[i].set_ylabel('Frequency')
@@ -258,8 +271,16 @@ class DataVisualizer:
         top_n : int
             Number of top users to display.
         """
-        top_users = data.groupby(user_id_column)[transaction_column].max().nlargest(top_n)
-        
+        grouped = data.groupby(user_id_column, sort=False)[transaction_column].max()
+        vals = grouped.to_numpy()
+        names = grouped.index.to_numpy()
+
+        # Partial sort: select the top_n users in O(U), then order only those
+        k = min(top_n, len(vals))
+        part = np.argpartition(-vals, k - 1)[:k]
+        order = part[np.argsort(-vals[part], kind='stable')]
+        top_users = pd.Series(vals[order], index=names[order])
+
         plt.figure(figsize=(12, 5))
         sns.barplot(x=top_users.index, hue= top_users.index, y=top_users.values, palette='coolwarm')
         plt.xticks(rotation=45)
@@ -287,9 +308,8 @@ class DataVisualizer:
         """
         try:
             # Calculate fraud rate per country
-            fraud_counts = data.groupby(country_column)[class_column].sum()
-            total_counts = data[country_column].value_counts()
-            fraud_rate = (fraud_counts / total_counts).fillna(0) * 100  # Convert to percentage
+            counts = data.groupby(country_column, sort=False, observed=True)[class_column].agg(total='count', frauds='sum')
+            fraud_rate = counts['frauds'] / counts['total'] * 100  # Convert to percentage
 
             # Select top N fraudulent countries
             top_fraud_countries = fraud_rate.nlargest(top_n)
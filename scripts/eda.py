@@ -4,6 +4,11 @@ import matplotlib.pyplot as plt
 import logging
 from pathlib import Path
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from scripts.preprocessing import classify_columns, optimize_dtypes
 
 
 # Configure logging
@@ -21,28 +26,58 @@ class EDA:
         self.input_path = Path(input_path)
         self.data = None
 
-    def load_data(self, file_name: str):
+    def load_data(self, file_name: str, columns: list = None, parse_dates: list = None):
         """
         Load data from a CSV file and ensure proper data types.
+
+        The CSV is parsed once with PyArrow and cached as a Parquet sidecar next to it;
+        later loads read the sidecar while it is newer than the CSV. ISO-formatted
+        timestamps are inferred automatically; `parse_dates` converts the listed columns
+        to datetime64 after loading, on both paths, so later methods never re-parse them.
         """
         file_path = self.input_path / file_name
-        logging.info(f"Loading data from {file_path}")
-        self.data = pd.read_csv(file_path)
+        pq_path = file_path.with_suffix(".parquet")
+        if pq_path.exists() and (not file_path.exists() or pq_path.stat().st_mtime >= file_path.stat().st_mtime):
+            logging.info(f"Loading cached data from {pq_path}")
+            self.data = pd.read_parquet(pq_path, engine="pyarrow", columns=columns)
+        else:
+            logging.info(f"Loading data from {file_path}")
+            table = pv.read_csv(file_path, read_options=pv.ReadOptions(use_threads=True))
+            try:
+                pq.write_table(table, pq_path, compression="zstd")
+            except OSError as e:
+                logging.warning(f"Could not write Parquet cache {pq_path}: {e}")
+            if columns is not None:
+                table = table.select(columns)
+            self.data = table.to_pandas()
+        # Parse requested columns after either read, so a warm cache never changes the result
+        for col in parse_dates or []:
+            if col in self.data.columns and not pd.api.types.is_datetime64_any_dtype(self.data[col]):
+                self.data[col] = pd.to_datetime(self.data[col], format="ISO8601")
+        # Parquet cannot store second resolution, so normalize timestamps to ns on both paths
+        for col in classify_columns(self.data)["datetime"]:
+            self.data[col] = self.data[col].dt.as_unit("ns")
+        self.data = optimize_dtypes(self.data)
 
         logging.info("Data loaded successfully.")
         return self.data
 
-    def overview(self):
+    def overview(self, include_duplicates=True):
         """
         Display an overview of the dataset.
+
+        Args:
+            include_duplicates (bool): Whether to count duplicate rows (hashes every row).
         """
         logging.info("Dataset Overview:")
-        info = self.data.info()
+        dtypes = self.data.dtypes
         shape = self.data.shape
-        duplicates = self.data.duplicated().sum()
+        null_counts = self.data.isna().sum()
+        duplicates = self.data.duplicated().sum() if include_duplicates else None
         logging.info(f"Shape: {shape}")
-        logging.info(f"Number of duplicate rows: {duplicates}")
-        return {"info": info, "shape": shape, "duplicates": duplicates}
+        if include_duplicates:
+            logging.info(f"Number of duplicate rows: {duplicates}")
+        return {"dtypes": dtypes, "shape": shape, "null_counts": null_counts, "duplicates": duplicates}
 
     def summary_statistics(self, data = None):
         """
@@ -56,40 +91,137 @@ class EDA:
         logging.info(stats)
         return stats
 
-    def visualize_numerical_distributions(self):
+    def streaming_summary_statistics(self, file_name: str, block_size: int = None):
+        """
+        Generate summary statistics for numeric columns by streaming a CSV file in
+        record batches, so peak memory stays at one batch instead of the whole file.
+
+        Args:
+            file_name (str): Name of the CSV file in the input directory.
+            block_size (int): Bytes per parsed block; None uses PyArrow's default.
+
+        Returns:
+            pd.DataFrame: count, null_count, mean, std, min and max per numeric column.
+        """
+        file_path = self.input_path / file_name
+        logging.info(f"Streaming summary statistics from {file_path}")
+        read_options = pv.ReadOptions(block_size=block_size) if block_size else None
+        reader = pv.open_csv(file_path, read_options=read_options)
+
+        numeric_cols = [
+            field.name for field in reader.schema
+            if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        ]
+        stats = {
+            col: {"count": 0, "null_count": 0, "mean": 0.0, "m2": 0.0, "min": np.inf, "max": -np.inf}
+            for col in numeric_cols
+        }
+
+        for batch in reader:
+            for col in numeric_cols:
+                values = batch.column(col)
+                running = stats[col]
+                running["null_count"] += values.null_count
+                n = len(values) - values.null_count
+                if n == 0:
+                    continue
+                batch_mean = pc.mean(values).as_py()
+                batch_m2 = pc.variance(values, ddof=0).as_py() * n
+                min_max = pc.min_max(values)
+
+                # Chan et al. pairwise update of the running mean and sum of squared deviations
+                total = running["count"] + n
+                delta = batch_mean - running["mean"]
+                running["mean"] += delta * n / total
+                running["m2"] += batch_m2 + delta ** 2 * running["count"] * n / total
+                running["count"] = total
+                running["min"] = min(running["min"], min_max["min"].as_py())
+                running["max"] = max(running["max"], min_max["max"].as_py())
+
+        summary = pd.DataFrame.from_dict(stats, orient="index")
+        count = summary["count"]
+        summary["std"] = np.sqrt(summary["m2"] / (count - 1).where(count > 1))
+        summary.loc[count == 0, ["mean", "min", "max"]] = np.nan
+        summary = summary[["count", "null_count", "mean", "std", "min", "max"]]
+        logging.info(summary)
+        return summary
+
+    def visualize_numerical_distributions(self, kde=False):
         """
         Visualize the distribution of numerical features.
+        Plot 3 images per row in a single figure.
+
+        Args:
+            kde (bool): Whether to overlay a kernel density estimate (costly on large datasets).
         """
         numeric_cols = self.data.select_dtypes(include="number").columns
+        if len(numeric_cols) == 0:
+            return
+
+        num_plots = len(numeric_cols)
+        num_rows = (num_plots // 3) + int(num_plots % 3 != 0)
+
+        fig, axes = plt.subplots(num_rows, 3, figsize=(18, 4 * num_rows))
+        axes = axes.flatten()
 
-        for col in numeric_cols:
-            plt.figure(figsize=(8, 4))
-            sns.histplot(self.data[col], kde=True, bins=30)
-            plt.title(f"Distribution of {col}")
-            plt.show()
+        for i, col in enumerate(numeric_cols):
+            sns.histplot(self.data[col], kde=kde, bins=30, ax=axes[i])
+            axes[i].set_title(f"Distribution of {col}")
+
+        for j in range(i + 1, len(axes)):
+            fig.delaxes(axes[j])
+
+        plt.tight_layout()
+        plt.show()
 
     def visualize_categorical_distributions(self, unique_value_threshold=30):
         """
         Visualize the distribution of categorical features with manageable unique values.
+        Plot 3 images per row in a single figure.
         """
-        categorical_cols = self.data.select_dtypes(include="object").columns
-        for col in categorical_cols:
-            if self.data[col].nunique() <= unique_value_threshold:
-                plt.figure(figsize=(8, 4))
-                sns.countplot(data=self.data, x=col, order=self.data[col].value_counts().index)
-                plt.title(f"Distribution of {col}")
-                plt.xticks(rotation=45)
-                plt.show()
+        categorical_cols = classify_columns(self.data)["categorical"]
+        nuniques = self.data[categorical_cols].nunique()
+        cols_to_plot = []
+        for col, unique_values in nuniques.items():
+            if unique_values <= unique_value_threshold:
+                cols_to_plot.append(col)
             else:
-                logging.info(f"Skipping column {col} with {self.data[col].nunique()} unique values.")
+                logging.info(f"Skipping column {col} with {unique_values} unique values.")
+        if not cols_to_plot:
+            return
+
+        num_plots = len(cols_to_plot)
+        num_rows = (num_plots // 3) + int(num_plots % 3 != 0)
+
+        fig, axes = plt.subplots(num_rows, 3, figsize=(18, 4 * num_rows))
+        axes = axes.flatten()
+
+        for i, col in enumerate(cols_to_plot):
+            # Count once and plot the counts, rather than letting countplot recount the column
+            counts = self.data[col].value_counts()
+            counts = counts[counts > 0]
+            sns.barplot(x=counts.index.astype(str), y=counts.to_numpy(), ax=axes[i])
+            axes[i].set_ylabel("count")
+            axes[i].set_title(f"Distribution of {col}")
+            axes[i].tick_params(axis="x", rotation=45)
+
+        for j in range(i + 1, len(axes)):
+            fig.delaxes(axes[j])
 
-    def detect_outliers(self):
+        plt.tight_layout()
+        plt.show()
+
+    def detect_outliers(self, max_fliers=2000):
         """
         Detect outliers using box plots, excluding binary or low-variability columns.
         Plot 3 images per row.
+
+        Box statistics are computed once per column with NumPy and drawn directly; at most
+        `max_fliers` outlier points (a fixed random sample plus the extremes) are rendered per column.
         """
         numeric_cols = self.data.select_dtypes(include="number").columns
-        cols_to_plot = [col for col in numeric_cols if self.data[col].nunique() > 2]  # Exclude binary columns
+        nuniques = self.data[numeric_cols].nunique()
+        cols_to_plot = nuniques.index[nuniques > 2]  # Exclude binary columns
 
         num_plots = len(cols_to_plot)
         num_rows = (num_plots // 3) + int(num_plots % 3 != 0)
@@ -97,8 +229,22 @@ class EDA:
         fig, axes = plt.subplots(num_rows, 3, figsize=(20, 5 * num_rows))
         axes = axes.flatten()
 
+        rng = np.random.default_rng(0)
         for i, col in enumerate(cols_to_plot):
-            sns.boxplot(data=self.data, x=col, ax=axes[i])
+            values = self.data[col].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            q1, median, q3 = np.percentile(values, [25, 50, 75])
+            lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            inside = (values >= lower) & (values <= upper)
+            fliers = values[~inside]
+            if len(fliers) > max_fliers:
+                # Always keep the extremes so the sampled plot spans the same range
+                fliers = np.concatenate([rng.choice(fliers, max_fliers, replace=False), [fliers.min(), fliers.max()]])
+            stats = {
+                "label": col, "med": median, "q1": q1, "q3": q3,
+                "whislo": values[inside].min(), "whishi": values[inside].max(), "fliers": fliers,
+            }
+            axes[i].bxp([stats])
             axes[i].set_title(f"Outliers in {col}")
 
         for j in range(i + 1, len(axes)):
@@ -126,7 +272,8 @@ class EDA:
         """
         if "purchase_time" in self.data.columns:
             logging.info("Creating time-based features: 'hour_of_day' and 'day_of_week'")
-            self.data["purchase_time"] = pd.to_datetime(self.data["purchase_time"])
+            if not pd.api.types.is_datetime64_any_dtype(self.data["purchase_time"]):
+                self.data["purchase_time"] = pd.to_datetime(self.data["purchase_time"], format="ISO8601", cache=True)
             self.data["hour_of_day"] = self.data["purchase_time"].dt.hour
             self.data["day_of_week"] = self.data["purchase_time"].dt.dayofweek
 
@@ -1,6 +1,13 @@
 import pandas as pd
+import numpy as np
 import logging
-from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+from scripts.caching import cached_parquet
+from scripts.preprocessing import min_max_scale
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -28,43 +35,99 @@ class FeatureEngineer:
         pd.DataFrame
             Dataset with new time-based features.
         """
-        try:
-            data['hour_of_day'] = data[time_column].dt.hour
-            data['day_of_week'] = data[time_column].dt.dayofweek
-            logging.info(f"Time-based features created: 'hour_of_day', 'day_of_week' from {time_column}.")
-            return data
-        except Exception as e:
-            logging.error(f"Error creating time-based features from {time_column}: {e}")
-            return data
+        times = data[time_column]
+        if isinstance(times.dtype, pd.DatetimeTZDtype):
+            # Use local wall-clock time like the .dt accessors, not the UTC instants
+            times = times.dt.tz_localize(None)
+
+        # Derive both fields from one hour-resolution view; the epoch (1970-01-01) was a Thursday
+        hours = times.to_numpy(dtype='datetime64[h]')
+        missing = np.isnat(hours)
+        hours = hours.astype(np.int64)
+        hour_of_day = (hours % 24).astype(np.uint8)
+        day_of_week = ((hours // 24 + 3) % 7).astype(np.uint8)
+        if missing.any():
+            hour_of_day = pd.arrays.IntegerArray(hour_of_day, missing)
+            day_of_week = pd.arrays.IntegerArray(day_of_week, missing)
+        data['hour_of_day'] = hour_of_day
+        data['day_of_week'] = day_of_week
+        logging.info(f"Time-based features created: 'hour_of_day', 'day_of_week' from {time_column}.")
+        return data
 
     @staticmethod
+    @cached_parquet
     def create_transaction_features(data, user_id_column, transaction_time_column):
         """
         Creates transaction frequency and velocity features for each user.
+
+        Pass `cache_path=` to persist the result as Parquet and reuse it on later calls
+        (`force=True` recomputes); see `scripts.caching.cached_parquet`.
         """
-        try:
-            # Ensure datetime format
-            data[transaction_time_column] = pd.to_datetime(data[transaction_time_column])
+        # Ensure datetime format, parsing only if the column is not already datetime64
+        if not pd.api.types.is_datetime64_any_dtype(data[transaction_time_column]):
+            data[transaction_time_column] = pd.to_datetime(data[transaction_time_column], format='ISO8601', cache=True)
+
+        # Count, first and last transaction per user in a single groupby pass
+        per_user = data.groupby(user_id_column, sort=False)[transaction_time_column].agg(['count', 'min', 'max'])
+
+        # Time span between first and last transaction per user (in days)
+        per_user['span'] = (per_user['max'] - per_user['min']).dt.days + 1
 
-            # Transaction count per user
-            data['transaction_count'] = data.groupby(user_id_column)[transaction_time_column].transform('count')
+        # Broadcast the per-user aggregates back to every transaction
+        per_row = per_user.reindex(data[user_id_column])
+        data['transaction_count'] = per_row['count'].to_numpy()
+        data['days_since_first_transaction'] = per_row['span'].to_numpy()
 
-            # Time span between first and last transaction per user (in days)
-            data['days_since_first_transaction'] = (
-                data.groupby(user_id_column)[transaction_time_column]
-                .transform(lambda x: (x.max() - x.min()).days + 1)
-            )
+        # Transaction velocity: transactions per day per user
+        data['transaction_velocity'] = data['transaction_count'] / data['days_since_first_transaction']
 
-            # Transaction velocity: transactions per day per user
-            data['transaction_velocity'] = data['transaction_count'] / data['days_since_first_transaction']
+        logging.info("Transaction frequency and velocity features created.")
+        return data
 
-            logging.info("Transaction frequency and velocity features created.")
-            return data
+    @staticmethod
+    def create_transaction_features_pl(data, user_id_column, transaction_time_column):
+        """
+        Polars implementation of `create_transaction_features` for large datasets.
 
-        except Exception as e:
-            logging.error(f"Error creating transaction features: {e}")
-            return data
+        Parameters:
+        ----------
+        data : pl.DataFrame or pd.DataFrame
+            The transaction dataset; pandas input is converted to Polars once.
+        user_id_column : str
+            The column representing the user ID.
+        transaction_time_column : str
+            The column representing the transaction time.
 
+        Returns:
+        --------
+        pd.DataFrame
+            Arrow-backed dataset with 'transaction_count', 'days_since_first_transaction'
+            and 'transaction_velocity' features, keeping the index of pandas input.
+        """
+        if pl is None:
+            raise ImportError("polars is required for create_transaction_features_pl.")
+        index = None
+        if not isinstance(data, pl.DataFrame):
+            index = data.index
+            data = pl.from_pandas(data)
+
+        time_col = pl.col(transaction_time_column)
+        if not data.schema[transaction_time_column].is_temporal():
+            data = data.with_columns(time_col.str.to_datetime())
+
+        data = data.with_columns(
+            time_col.count().over(user_id_column).alias('transaction_count'),
+            ((time_col.max() - time_col.min()).over(user_id_column).dt.total_days() + 1)
+            .alias('days_since_first_transaction'),
+        ).with_columns(
+            (pl.col('transaction_count') / pl.col('days_since_first_transaction')).alias('transaction_velocity')
+        )
+
+        logging.info("Transaction frequency and velocity features created with Polars.")
+        data = data.to_pandas(use_pyarrow_extension_array=True)
+        if index is not None:
+            data.index = index
+        return data
 
     @staticmethod
     def create_high_risk_country_flag(data, country_column, high_risk_countries):
@@ -83,48 +146,44 @@ class FeatureEngineer:
         pd.DataFrame
             Dataset with a new column 'high_risk_country' (1 = high risk, 0 = low risk).
         """
-        try:
-
-            # Create a binary flag for high-risk countries
-            data['high_risk_country'] = data[country_column].apply(lambda x: 1 if x in high_risk_countries else 0)
-
-            logging.info(f"Created 'high_risk_country' feature using {len(high_risk_countries)} high-fraud countries.")
-            return data
-
-        except Exception as e:
-            logging.error(f"Error creating high-risk country flag: {e}")
-            return data
+        # Create a binary flag for high-risk countries
+        high_risk = frozenset(high_risk_countries)
+        countries = data[country_column]
+        if isinstance(countries.dtype, pd.CategoricalDtype):
+            # Test each category once, then expand through the integer codes
+            category_flags = countries.cat.categories.isin(high_risk)
+            codes = countries.cat.codes.to_numpy()
+            # Code -1 (missing) picks the appended False
+            data['high_risk_country'] = np.append(category_flags, False)[codes].astype(np.uint8)
+        else:
+            data['high_risk_country'] = countries.isin(high_risk).astype(np.uint8)
+
+        logging.info(f"Created 'high_risk_country' feature using {len(high_risk_countries)} high-fraud countries.")
+        return data
 
     @staticmethod
     def normalize_numerical_features(data, columns):
         """
         Normalizes numerical features using Min-Max Scaling.
         """
-        try:
-            scaler = MinMaxScaler()
-            data[columns] = scaler.fit_transform(data[columns])
-            logging.info(f"Normalized columns: {columns}.")
-            return data
-        except Exception as e:
-            logging.error(f"Error normalizing numerical features: {e}")
-            return data
+        data = min_max_scale(data, columns)
+        logging.info(f"Normalized columns: {columns}.")
+        return data
 
     @staticmethod
     def encode_categorical_features(data, categorical_columns):
         """
         Encodes categorical features using One-Hot Encoding.
+
+        The indicators are sparse uint8 columns; use `data[cols].sparse.to_coo()` to hand
+        them to a model as a SciPy sparse matrix instead of densifying.
         """
-        try:
-            encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
-            encoded_df = pd.DataFrame(encoder.fit_transform(data[categorical_columns]))
-            encoded_df.columns = encoder.get_feature_names_out(categorical_columns)
-
-            # Drop original categorical columns and add encoded ones
-            data = data.drop(columns=categorical_columns).reset_index(drop=True)
-            data = pd.concat([data, encoded_df], axis=1)
-
-            logging.info(f"Encoded categorical features: {categorical_columns}.")
-            return data
-        except Exception as e:
-            logging.error(f"Error encoding categorical features: {e}")
-            return data
+        # Encode only the categorical block and attach it in place, so the remaining
+        # columns are not copied into a new frame
+        encoded = pd.get_dummies(data[categorical_columns], sparse=True, dtype=np.uint8)
+        data.drop(columns=categorical_columns, inplace=True)
+        data[encoded.columns] = encoded
+
+        logging.info(f"Encoded categorical features: {categorical_columns}.")
+        logging.info(f"Memory usage after encoding: {data.memory_usage(deep=True).sum() / 1e6:.2f} MB.")
+        return data
@@ -1,7 +1,29 @@
 import pandas as pd
-import socket
-import struct
+import numpy as np
 import logging
+from scripts.caching import cached_parquet
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Range tables at least this large use the compiled lookup kernel when numba is installed
+NUMBA_MIN_RANGES = 100_000
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _interval_lookup_kernel(ip_ints, lower_bounds, upper_bounds, out):
+        for i in prange(ip_ints.size):
+            idx = np.searchsorted(lower_bounds, ip_ints[i], side='right') - 1
+            out[i] = idx if idx >= 0 and ip_ints[i] <= upper_bounds[idx] else -1
+else:
+    _interval_lookup_kernel = None
 
 
 # Configure logging
@@ -13,31 +35,97 @@ class GeolocationAnalyzer:
     A class to handle geolocation-based analysis and merging of IP address data.
     """
 
+    def __init__(self, ip_data):
+        """
+        Initializes the analyzer with a geolocation table, sorted once so that any
+        number of fraud batches can be merged against it.
+
+        Parameters:
+        ----------
+        ip_data : pd.DataFrame
+            The geolocation dataset containing 'lower_bound_ip_address', 'upper_bound_ip_address'
+            and 'country'.
+        """
+        ip_data = ip_data.sort_values('lower_bound_ip_address')
+        # int64 to match the fraud IPs, so lookups never have to convert the cached bounds
+        self.lower_bounds = ip_data['lower_bound_ip_address'].to_numpy(dtype=np.int64)
+        self.upper_bounds = ip_data['upper_bound_ip_address'].to_numpy(dtype=np.int64)
+        self.countries = ip_data['country'].to_numpy()
+
+    @staticmethod
+    def ips_to_int(ips):
+        """
+        Convert a column of IP addresses to their integer representation.
+
+        Parameters:
+        ----------
+        ips : pd.Series
+            IP addresses, either numeric (e.g. 732758368.79) or dotted strings (e.g. "192.168.1.1").
+
+        Returns:
+        --------
+        pd.Series
+            Integer representation of each IP address as float64, NaN where missing or invalid.
+        """
+        if pd.api.types.is_numeric_dtype(ips):
+            ip_int = np.floor(ips.astype(float))
+        else:
+            octets = ips.str.split('.', expand=True)
+            # Rows with more than four parts are invalid; missing rows may leave fewer than four columns
+            extra_parts = octets.iloc[:, 4:].notna().any(axis=1)
+            octets = octets.reindex(columns=range(4)).apply(pd.to_numeric, errors='coerce').astype(float)
+            ip_int = octets[0] * 2**24 + octets[1] * 2**16 + octets[2] * 2**8 + octets[3]
+            valid = ((octets >= 0) & (octets <= 255)).all(axis=1) & ~extra_parts
+            ip_int = ip_int.where(valid)
+
+        return ip_int.where((ip_int >= 0) & (ip_int < 2**32))
+
     @staticmethod
-    def ip_to_int(ip):
+    def _interval_lookup(ip_ints, lower_bounds, upper_bounds):
         """
-        Convert an IP address to its integer representation.
+        Find the IP range containing each address.
 
         Parameters:
         ----------
-        ip : str
-            IP address in string format (e.g., "192.168.1.1").
+        ip_ints : np.ndarray
+            Integer IP addresses to look up.
+        lower_bounds, upper_bounds : np.ndarray
+            Range bounds, sorted by lower bound.
 
         Returns:
         --------
-        int or None
-            Converted integer representation of the IP address or None if invalid.
+        np.ndarray
+            Index of the matching range for each address, or -1 if none contains it.
         """
-        try:
-            return struct.unpack("!I", socket.inet_aton(ip))[0]
-        except socket.error:
-            return None  # Handle invalid IPs gracefully
+        if _interval_lookup_kernel is not None and len(lower_bounds) >= NUMBA_MIN_RANGES:
+            out = np.empty(len(ip_ints), dtype=np.int64)
+            _interval_lookup_kernel(
+                np.ascontiguousarray(ip_ints, dtype=np.int64),
+                np.ascontiguousarray(lower_bounds, dtype=np.int64),
+                np.ascontiguousarray(upper_bounds, dtype=np.int64),
+                out,
+            )
+            return out
+
+        if len(lower_bounds) == 0:
+            return np.full(len(ip_ints), -1, dtype=np.int64)
+
+        # Locate the last range whose lower bound is <= ip_int, then check its upper bound
+        idx = np.searchsorted(lower_bounds, ip_ints, side='right') - 1
+        valid = (idx >= 0) & (ip_ints <= upper_bounds[idx.clip(0)])
+        return np.where(valid, idx, -1)
 
     @staticmethod
+    @cached_parquet
     def merge_fraud_with_geolocation(fraud_data, ip_data):
         """
         Merges fraud data with geolocation data based on IP address ranges.
 
+        Pass `cache_path=` to persist the result as Parquet and reuse it on later calls
+        (`force=True` recomputes); see `scripts.caching.cached_parquet`. When merging
+        several fraud batches against the same table, build `GeolocationAnalyzer(ip_data)`
+        once and call `merge` instead so the table is sorted only once.
+
         Parameters:
         ----------
         fraud_data : pd.DataFrame
@@ -48,48 +136,100 @@ class GeolocationAnalyzer:
         Returns:
         --------
         pd.DataFrame
-            Merged dataset including country information.
+            Fraud dataset in its original row order with a 'country' column
+            (None where the IP falls outside every known range).
         """
-        try:
-            logging.info("Converting IP addresses to integers...")
-
-            # Convert fraud IPs to integer format
-            fraud_data['ip_int'] = fraud_data['ip_address'].apply(lambda x: GeolocationAnalyzer.ip_to_int(str(int(x))) if not pd.isna(x) else None)
-
-            # Drop invalid IPs
-            fraud_data.dropna(subset=['ip_int'], inplace=True)
-
-            # Convert lower and upper bound IPs to integer
-            ip_data['lower_bound_ip_address'] = ip_data['lower_bound_ip_address'].astype(int)
-            ip_data['upper_bound_ip_address'] = ip_data['upper_bound_ip_address'].astype(int)
-
-            # Sort both datasets for merge_asof
-            fraud_data.sort_values('ip_int', inplace=True)
-            ip_data.sort_values('lower_bound_ip_address', inplace=True)
-
-            logging.info("Merging datasets...")
-            # Perform an asof merge (optimized for range-based matching)
-            merged_data = pd.merge_asof(
-                fraud_data,
-                ip_data,
-                left_on='ip_int',
-                right_on='lower_bound_ip_address',
-                direction='backward'
-            )
+        return GeolocationAnalyzer(ip_data).merge(fraud_data)
 
-            # Filter rows where ip_int is within the lower and upper bounds
-            merged_data = merged_data[
-                (merged_data['ip_int'] >= merged_data['lower_bound_ip_address']) &
-                (merged_data['ip_int'] <= merged_data['upper_bound_ip_address'])
-            ]
+    @cached_parquet
+    def merge(self, fraud_data):
+        """
+        Merges fraud data with this analyzer's geolocation table based on IP address ranges.
+
+        Parameters:
+        ----------
+        fraud_data : pd.DataFrame
+            The fraud dataset containing an 'ip_address' column.
+
+        Returns:
+        --------
+        pd.DataFrame
+            Fraud dataset in its original row order with a 'country' column
+            (None where the IP falls outside every known range).
+        """
+        logging.info("Converting IP addresses to integers...")
+
+        # Convert fraud IPs to integer format
+        fraud_data['ip_int'] = GeolocationAnalyzer.ips_to_int(fraud_data['ip_address'])
+
+        # Drop invalid IPs
+        fraud_data.dropna(subset=['ip_int'], inplace=True)
+        fraud_data['ip_int'] = fraud_data['ip_int'].astype(np.int64)
 
-            # Drop unnecessary columns
-            merged_data.drop(columns=['lower_bound_ip_address', 'upper_bound_ip_address'], inplace=True)
+        logging.info("Merging datasets...")
+        ip_ints = fraud_data['ip_int'].to_numpy(dtype=np.int64)
+        idx = GeolocationAnalyzer._interval_lookup(ip_ints, self.lower_bounds, self.upper_bounds)
+        # Index -1 (no matching range) picks the appended None
+        fraud_data['country'] = np.append(self.countries, None)[idx]
 
-            logging.info("Successfully merged fraud data with geolocation information.")
+        logging.info("Successfully merged fraud data with geolocation information.")
 
-            return merged_data
+        return fraud_data
 
-        except Exception as e:
-            logging.error(f"Error merging fraud data with geolocation: {e}")
-            return fraud_data
+    @staticmethod
+    def merge_fraud_with_geolocation_pl(fraud_data, ip_data):
+        """
+        Polars implementation of `merge_fraud_with_geolocation` for large datasets.
+
+        Parameters:
+        ----------
+        fraud_data : pl.DataFrame or pd.DataFrame
+            The fraud dataset containing a numeric 'ip_address' column.
+        ip_data : pl.DataFrame or pd.DataFrame
+            The geolocation dataset containing 'lower_bound_ip_address' and 'upper_bound_ip_address'.
+
+        Returns:
+        --------
+        pd.DataFrame
+            Arrow-backed fraud dataset in its original row order with a 'country' column
+            (null where the IP falls outside every known range). As in the pandas version,
+            rows whose IP is missing or outside [0, 2**32) are dropped and the surviving
+            rows keep their index labels (positions for Polars input).
+        """
+        if pl is None:
+            raise ImportError("polars is required for merge_fraud_with_geolocation_pl.")
+        if isinstance(fraud_data, pl.DataFrame):
+            index = pd.RangeIndex(fraud_data.height)
+        else:
+            index = fraud_data.index
+            fraud_data = pl.from_pandas(fraud_data)
+        if not isinstance(ip_data, pl.DataFrame):
+            ip_data = pl.from_pandas(ip_data)
+
+        fraud_data = (
+            fraud_data.with_row_index('_row')
+            .with_columns(pl.col('ip_address').cast(pl.Float64).fill_nan(None).floor().alias('ip_int'))
+            .filter(pl.col('ip_int').is_between(0, 2**32, closed='left'))
+            .with_columns(pl.col('ip_int').cast(pl.Int64))
+            .sort('ip_int')
+        )
+        ip_data = ip_data.select(
+            pl.col('lower_bound_ip_address').cast(pl.Int64),
+            pl.col('upper_bound_ip_address').cast(pl.Int64),
+            'country',
+        ).sort('lower_bound_ip_address')
+
+        logging.info("Merging datasets with Polars...")
+        merged_data = (
+            fraud_data.join_asof(ip_data, left_on='ip_int', right_on='lower_bound_ip_address', strategy='backward')
+            .with_columns(
+                pl.when(pl.col('ip_int') <= pl.col('upper_bound_ip_address')).then(pl.col('country')).alias('country')
+            )
+            .sort('_row')
+            .drop('lower_bound_ip_address', 'upper_bound_ip_address')
+        )
+
+        logging.info("Successfully merged fraud data with geolocation information.")
+        merged_data = merged_data.to_pandas(use_pyarrow_extension_array=True)
+        merged_data.index = index[merged_data.pop('_row').to_numpy()]
+        return merged_data
@@ -0,0 +1,127 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def classify_columns(data):
+    """
+    Classifies the columns of a dataset by dtype in a single pass.
+
+    Args:
+        data (pd.DataFrame): Dataset.
+
+    Returns:
+        dict: Column names keyed by "numeric", "categorical" and "datetime".
+    """
+    columns = {"numeric": [], "categorical": [], "datetime": []}
+    for col, dtype in data.dtypes.items():
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            columns["datetime"].append(col)
+        elif isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) \
+                or pd.api.types.is_string_dtype(dtype):
+            columns["categorical"].append(col)
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            columns["numeric"].append(col)
+    return columns
+
+
+def categorize(data, max_cardinality=1000):
+    """
+    Converts low-cardinality string columns to the category dtype so later
+    grouping and encoding work on integer codes instead of Python strings.
+
+    Args:
+        data (pd.DataFrame): Dataset.
+        max_cardinality (int): Maximum unique values for a column to be converted.
+
+    Returns:
+        pd.DataFrame: Dataset with categorical string columns.
+    """
+    for col in classify_columns(data)["categorical"]:
+        if isinstance(data[col].dtype, pd.CategoricalDtype):
+            continue
+        unique_values = data[col].nunique()
+        if unique_values <= max_cardinality and unique_values < 0.5 * len(data):
+            data[col] = data[col].astype("category")
+            logging.info(f"Converted column {col} with {unique_values} unique values to category.")
+    return data
+
+
+def downcast(data, floats=True):
+    """
+    Downcasts numeric columns to the smallest dtype that holds their values.
+
+    Integer narrowing is lossless. Float narrowing is not: `pd.to_numeric(downcast="float")`
+    accepts float32 rounding (e.g. 149.62 becomes 149.619995), and a float 'ip_address'
+    is floored to uint32.
+
+    Args:
+        data (pd.DataFrame): Dataset.
+        floats (bool): Whether to also apply the lossy float narrowing.
+
+    Returns:
+        pd.DataFrame: Dataset with narrower numeric dtypes.
+    """
+    initial_memory = data.memory_usage(deep=True).sum()
+
+    # IPs are integral but stored as float64; float32 would lose precision, so use uint32
+    if floats and "ip_address" in data.columns:
+        ip = data["ip_address"]
+        if pd.api.types.is_numeric_dtype(ip) and ip.notna().all() and ip.min() >= 0 and ip.max() < 2**32:
+            data["ip_address"] = ip.astype(np.uint32)
+
+    for col in classify_columns(data)["numeric"]:
+        if col == "ip_address":
+            continue
+        if pd.api.types.is_integer_dtype(data[col]):
+            data[col] = pd.to_numeric(data[col], downcast="integer")
+        elif floats and pd.api.types.is_float_dtype(data[col]):
+            data[col] = pd.to_numeric(data[col], downcast="float")
+
+    final_memory = data.memory_usage(deep=True).sum()
+    logging.info(f"Downcast numeric columns: {initial_memory / 1e6:.2f} MB -> {final_memory / 1e6:.2f} MB.")
+    return data
+
+
+def optimize_dtypes(data):
+    """
+    Applies `categorize` and the lossless part of `downcast`; both loaders call this so
+    a file yields the same dtypes. Float columns keep their values and are narrowed
+    later by `DataCleaner.clean_data`.
+
+    Args:
+        data (pd.DataFrame): Dataset.
+
+    Returns:
+        pd.DataFrame: Dataset with category string columns and narrower integer dtypes.
+    """
+    return downcast(categorize(data), floats=False)
+
+
+def min_max_scale(data, columns):
+    """
+    Min-max scales the given columns in place.
+
+    The columns are scaled together as one float32 block. Constant columns map to 0,
+    as with sklearn's MinMaxScaler.
+
+    Args:
+        data (pd.DataFrame): Dataset.
+        columns (list): List of column names to scale.
+
+    Returns:
+        pd.DataFrame: The same dataset with the columns scaled to [0, 1].
+    """
+    arr = data[columns].to_numpy(dtype=np.float32, copy=True)
+    mn = np.nanmin(arr, axis=0)
+    value_range = np.nanmax(arr, axis=0) - mn
+    value_range[value_range == 0] = 1
+    np.subtract(arr, mn, out=arr)
+    np.divide(arr, value_range, out=arr)
+    data[columns] = arr
+    return data
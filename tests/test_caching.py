@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from scripts.caching import cached_parquet
+from scripts.geolocation_analysis import GeolocationAnalyzer
+
+
+@pytest.fixture
+def counted_stage():
+    calls = []
+
+    @cached_parquet
+    def stage(value):
+        calls.append(value)
+        return pd.DataFrame({'value': [value]})
+
+    return stage, calls
+
+
+def test_cache_miss_writes_the_result(tmp_path, counted_stage):
+    stage, calls = counted_stage
+    path = tmp_path / 'stage' / 'out.parquet'
+
+    result = stage(1, cache_path=path)
+    assert calls == [1]
+    assert path.exists()
+    pd.testing.assert_frame_equal(pd.read_parquet(path), result)
+
+
+def test_cache_hit_skips_the_function(tmp_path, counted_stage):
+    stage, calls = counted_stage
+    path = tmp_path / 'out.parquet'
+    stage(1, cache_path=path)
+
+    result = stage(2, cache_path=path)
+    assert calls == [1]
+    assert result['value'].tolist() == [1]
+
+
+def test_force_recomputes_and_overwrites(tmp_path, counted_stage):
+    stage, calls = counted_stage
+    path = tmp_path / 'out.parquet'
+    stage(1, cache_path=path)
+
+    result = stage(2, cache_path=path, force=True)
+    assert calls == [1, 2]
+    assert result['value'].tolist() == [2]
+    assert pd.read_parquet(path)['value'].tolist() == [2]
+
+
+def test_no_cache_path_always_calls_the_function(counted_stage):
+    stage, calls = counted_stage
+    stage(1)
+    stage(1)
+    assert calls == [1, 1]
+
+
+def test_failed_merge_raises_and_writes_no_cache(tmp_path):
+    ip_data = pd.DataFrame({'lower_bound_ip_address': [0.0], 'upper_bound_ip_address': [10], 'country': ['A']})
+    path = tmp_path / 'merged.parquet'
+
+    with pytest.raises(KeyError):
+        GeolocationAnalyzer.merge_fraud_with_geolocation(pd.DataFrame({'ip': [1.0]}), ip_data, cache_path=path)
+    assert not path.exists()
+
+    merged = GeolocationAnalyzer.merge_fraud_with_geolocation(
+        pd.DataFrame({'ip_address': [1.0]}), ip_data, cache_path=path
+    )
+    assert merged['country'].tolist() == ['A']
+    assert pd.read_parquet(path)['country'].tolist() == ['A']
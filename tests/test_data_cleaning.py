@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.data_cleaning as data_cleaning
+from scripts.data_cleaning import DataCleaner
+from scripts.eda import EDA
+
+
+def test_handle_outliers_log_maps_non_positive_values_to_zero():
+    df = pd.DataFrame({'purchase_value': [0.0, -3.0, 1.0, 99.0, np.nan]})
+    result = DataCleaner().handle_outliers(df, [('purchase_value', 'log')])
+    expected = [0.0, 0.0, np.log1p(1.0), np.log1p(99.0), 0.0]
+    np.testing.assert_allclose(result['purchase_value'], expected)
+
+
+def test_handle_outliers_iqr_removes_rows_outside_bounds():
+    df = pd.DataFrame({'age': np.r_[np.arange(20, 40), 200, -50].astype(float)})
+    q1, q3 = df['age'].quantile([0.25, 0.75])
+    lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+
+    result = DataCleaner().handle_outliers(df.copy(), [('age', 'iqr')])
+    expected = df[(df['age'] >= lower) & (df['age'] <= upper)]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_handle_outliers_cap_clips_to_iqr_bounds():
+    df = pd.DataFrame({'age': np.r_[np.arange(20, 40), 200, -50].astype(float)})
+    q1, q3 = df['age'].quantile([0.25, 0.75])
+    lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+
+    result = DataCleaner().handle_outliers(df.copy(), [('age', 'cap')])
+    assert len(result) == len(df)
+    np.testing.assert_allclose(result['age'], df['age'].clip(lower, upper))
+
+
+def test_handle_outliers_zscore_cap_clips_to_standard_deviations():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'purchase_value': np.r_[rng.normal(50, 5, size=200), 500.0, -400.0]})
+    mean, std = df['purchase_value'].mean(), df['purchase_value'].std(ddof=0)
+
+    result = DataCleaner().handle_outliers(df.copy(), [('purchase_value', 'zscore_cap')], z_threshold=3)
+    assert len(result) == len(df)
+    np.testing.assert_allclose(result['purchase_value'], df['purchase_value'].clip(mean - 3 * std, mean + 3 * std))
+
+
+def test_handle_outliers_applies_row_filters_in_one_mask():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'age': np.r_[rng.integers(20, 40, size=200), 300, 30].astype(float),
+        'purchase_value': np.r_[rng.normal(50, 5, size=200), 50.0, 900.0],
+    }, index=np.arange(202) * 10)
+    q1, q3 = df['age'].quantile([0.25, 0.75])
+    age_ok = df['age'].between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    z = (df['purchase_value'] - df['purchase_value'].mean()) / df['purchase_value'].std(ddof=0)
+
+    result = DataCleaner().handle_outliers(df.copy(), [('age', 'iqr'), ('purchase_value', 'zscore')])
+    # Both filters use bounds from the full frame and keep the original index labels
+    pd.testing.assert_frame_equal(result, df[age_ok & (z.abs() <= 3)])
+    assert not result.index.isin([2000, 2010]).any()
+
+
+def categorical_frame():
+    rng = np.random.default_rng(0)
+    n = 120
+    return pd.DataFrame({
+        'source': rng.choice(['SEO', 'Ads', 'Direct'], size=n),
+        'browser': pd.Categorical(rng.choice(['Chrome', 'Safari'], size=n), categories=['Chrome', 'IE', 'Safari']),
+        'device_id': [f'device{i}' for i in range(n)],
+        'purchase_value': rng.uniform(0, 100, size=n),
+    })
+
+
+def test_encode_categorical_dense_matches_per_column_get_dummies():
+    data = categorical_frame()
+    result = DataCleaner().encode_categorical(data.copy(), cardinality_threshold=50)
+
+    # device_id is skipped as high cardinality; the unused 'IE' category gets no column
+    expected = data[['device_id', 'purchase_value']]
+    for col in ['source', 'browser']:
+        values = data[col].astype(str)
+        expected = expected.join(pd.get_dummies(values, prefix=col, drop_first=True, dtype=np.uint8))
+    pd.testing.assert_frame_equal(result.sort_index(axis=1), expected.sort_index(axis=1), check_dtype=False)
+    assert (result.drop(columns=['device_id', 'purchase_value']).dtypes == np.uint8).all()
+
+
+def test_encode_categorical_as_sparse_matches_dense_output():
+    data = categorical_frame()
+    dense = DataCleaner().encode_categorical(data.copy(), cardinality_threshold=50)
+    rest, encoded, names = DataCleaner().encode_categorical(data.copy(), cardinality_threshold=50, as_sparse=True)
+
+    assert list(rest.columns) == ['device_id', 'purchase_value']
+    assert encoded.format == 'csr' and encoded.dtype == np.uint8
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(encoded.toarray(), columns=names), dense[list(names)].astype(np.uint8), check_names=False
+    )
+
+
+def test_encode_categorical_as_sparse_without_eligible_columns():
+    data = categorical_frame()[['device_id', 'purchase_value']]
+    rest, encoded, names = DataCleaner().encode_categorical(data.copy(), as_sparse=True)
+
+    pd.testing.assert_frame_equal(rest, data)
+    assert encoded.shape == (len(data), 0)
+    assert len(names) == 0
+
+
+def signup_frame():
+    return pd.DataFrame({
+        'signup_time': ['2015-02-24 22:55:49', '2015-06-07 20:39:50', None, '2015-01-01 00:00:00'],
+        'purchase_time': ['2015-04-18 02:47:11', '2015-06-08 01:38:54', '2015-01-01 00:00:00', None],
+    })
+
+
+def expected_time_since_signup(data):
+    signup = pd.to_datetime(data['signup_time'])
+    purchase = pd.to_datetime(data['purchase_time'])
+    return (purchase - signup).dt.total_seconds() / 3600
+
+
+def test_create_features_time_since_signup_from_strings_with_missing_times():
+    data = signup_frame()
+    result = DataCleaner().create_features(data.copy())
+
+    assert pd.api.types.is_datetime64_any_dtype(result['purchase_time'])
+    np.testing.assert_allclose(result['time_since_signup'], expected_time_since_signup(data))
+    assert result['time_since_signup'].isna().tolist() == [False, False, True, True]
+
+
+def test_create_features_keeps_parsed_datetime_columns():
+    data = signup_frame().apply(pd.to_datetime)
+    result = DataCleaner().create_features(data.copy())
+    pd.testing.assert_frame_equal(result[['signup_time', 'purchase_time']], data)
+    np.testing.assert_allclose(result['time_since_signup'], expected_time_since_signup(data))
+
+
+@pytest.mark.parametrize('use_numexpr', [True, False])
+def test_create_features_time_since_signup_with_and_without_numexpr(monkeypatch, use_numexpr):
+    if use_numexpr:
+        pytest.importorskip('numexpr')
+    else:
+        monkeypatch.setattr(data_cleaning, 'ne', None)
+    data = signup_frame()
+    result = DataCleaner().create_features(data.copy())
+    np.testing.assert_allclose(result['time_since_signup'], expected_time_since_signup(data))
+
+
+def test_create_features_hour_of_day_from_time():
+    data = pd.DataFrame({'Time': [0.0, np.nan, 7200.5, 90000.0, 3e9, -1.0]})
+    result = DataCleaner().create_features(data.copy())
+
+    expected = (data['Time'] % (3600 * 24)) // 3600
+    assert result['hour_of_day'].isna().tolist() == expected.isna().tolist()
+    assert result['hour_of_day'].dropna().tolist() == expected.dropna().tolist()
+    assert result['hour_of_day'].dropna().tolist() == [0, 2, 1, 5, 23]
+
+
+def test_clean_data_keeps_downcast_dtypes():
+    data = pd.DataFrame({
+        'age': np.r_[np.arange(20, 40), 200].astype(np.int64),
+        'purchase_value': np.r_[np.arange(20.0), 1e6],
+        'signup_delay': np.arange(21.0),
+    })
+    cleaned = DataCleaner().clean_data(data, ['age', 'purchase_value'], ['signup_delay'])
+
+    assert cleaned['age'].dtype == np.int16
+    assert cleaned['purchase_value'].dtype == np.float32
+    assert cleaned['age'].max() < 200
+    assert cleaned['purchase_value'].max() < 1e6
+
+
+def test_loaders_produce_the_same_lossless_dtypes(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 200
+    data = pd.DataFrame({
+        'user_id': np.arange(n),
+        'purchase_value': np.round(rng.uniform(0, 200, size=n), 2),
+        'source': rng.choice(['SEO', 'Ads'], size=n),
+        'device_id': [f'device{i}' for i in range(n)],
+        'ip_address': rng.uniform(0, 2**32 - 1, size=n),
+    })
+    data.to_csv(tmp_path / 'fraud.csv', index=False)
+
+    cleaner_data = DataCleaner(tmp_path).load_data('fraud.csv')
+    eda_data = EDA(tmp_path).load_data('fraud.csv')
+
+    pd.testing.assert_series_equal(cleaner_data.dtypes, eda_data.dtypes)
+    assert cleaner_data['user_id'].dtype == np.int16
+    assert isinstance(cleaner_data['source'].dtype, pd.CategoricalDtype)
+    # Float values are not rounded at load time
+    np.testing.assert_array_equal(cleaner_data['purchase_value'], data['purchase_value'])
+    np.testing.assert_array_equal(eda_data['ip_address'], data['ip_address'])
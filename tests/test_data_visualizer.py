@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.data_visualizer as data_visualizer
+from scripts.data_visualizer import DataVisualizer
+
+
+@pytest.fixture
+def captured_barplot(monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_visualizer.sns, 'barplot', lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(data_visualizer.plt, 'show', lambda: data_visualizer.plt.close('all'))
+    return calls
+
+
+@pytest.mark.parametrize('top_n', [1, 5, 50])
+def test_plot_top_users_selects_largest_per_user_maximum(captured_barplot, top_n):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'user_id': rng.integers(0, 30, size=300),
+        'transaction_count': rng.permutation(300),
+    })
+    DataVisualizer.plot_top_users_by_transactions(data, 'user_id', 'transaction_count', top_n=top_n)
+
+    expected = data.groupby('user_id')['transaction_count'].max().nlargest(top_n)
+    (call,) = captured_barplot
+    np.testing.assert_array_equal(np.asarray(call['x']), expected.index.to_numpy())
+    np.testing.assert_array_equal(np.asarray(call['y']), expected.to_numpy())
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.eda import EDA
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5000
+    data = pd.DataFrame({
+        'purchase_value': rng.gamma(2.0, 20.0, size=n),
+        'age': rng.integers(18, 70, size=n),
+        'source': rng.choice(['SEO', 'Ads', 'Direct'], size=n),
+        'signup_time': pd.date_range('2014-12-01', periods=n, freq='min').strftime('%Y-%m-%d %H:%M:%S'),
+        'purchase_time': pd.date_range('2015-01-01', periods=n, freq='min').strftime('%Y/%m/%d %H:%M'),
+    })
+    data.loc[::50, 'purchase_value'] = np.nan
+    data.to_csv(tmp_path / 'fraud.csv', index=False)
+    return tmp_path
+
+
+def test_streaming_summary_statistics_matches_describe(csv_dir):
+    eda = EDA(csv_dir)
+    # A small block size forces many batches through the pairwise merge
+    summary = eda.streaming_summary_statistics('fraud.csv', block_size=4096)
+    expected = pd.read_csv(csv_dir / 'fraud.csv').describe().transpose()
+
+    assert list(summary.index) == ['purchase_value', 'age']
+    for stat in ['count', 'mean', 'std', 'min', 'max']:
+        np.testing.assert_allclose(summary[stat], expected.loc[summary.index, stat], rtol=1e-9)
+    assert summary.loc['purchase_value', 'null_count'] == 100
+
+
+def test_load_data_returns_the_same_dtypes_from_csv_and_sidecar(csv_dir):
+    eda = EDA(csv_dir)
+    cold = eda.load_data('fraud.csv')
+    assert (csv_dir / 'fraud.parquet').exists()
+    warm = eda.load_data('fraud.csv')
+
+    pd.testing.assert_series_equal(cold.dtypes, warm.dtypes)
+    pd.testing.assert_frame_equal(cold, warm)
+    assert cold['signup_time'].dtype == 'datetime64[ns]'
+
+
+def test_load_data_parse_dates_on_a_cold_cache(csv_dir):
+    data = EDA(csv_dir).load_data('fraud.csv', parse_dates=['purchase_time'])
+    assert data['purchase_time'].dtype == 'datetime64[ns]'
+    assert data['purchase_time'].iloc[1] == pd.Timestamp('2015-01-01 00:01')
+
+
+def test_load_data_applies_parse_dates_on_a_warm_cache(csv_dir):
+    eda = EDA(csv_dir)
+    first = eda.load_data('fraud.csv')
+    assert (csv_dir / 'fraud.parquet').exists()
+    assert not pd.api.types.is_datetime64_any_dtype(first['purchase_time'])
+
+    cached = eda.load_data('fraud.csv', parse_dates=['purchase_time'])
+    (csv_dir / 'fraud.parquet').unlink()
+    cold = eda.load_data('fraud.csv', parse_dates=['purchase_time'])
+    assert cached['purchase_time'].dtype == 'datetime64[ns]'
+    pd.testing.assert_frame_equal(cached, cold)
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.feature_engineering import FeatureEngineer
+
+
+@pytest.fixture
+def transactions():
+    times = pd.Series(pd.date_range('1969-12-25', '2015-03-01', periods=500))
+    return pd.DataFrame({'user_id': np.arange(500) % 37, 'purchase_time': times})
+
+
+def transform_transaction_features(data, user_id_column, transaction_time_column):
+    # Reference: the per-feature groupby transforms this method replaced
+    grouped = data.groupby(user_id_column)[transaction_time_column]
+    count = grouped.transform('count')
+    days = grouped.transform(lambda x: (x.max() - x.min()).days + 1)
+    return pd.DataFrame({
+        'transaction_count': count,
+        'days_since_first_transaction': days,
+        'transaction_velocity': count / days,
+    })
+
+
+def test_high_risk_flag_with_string_column():
+    data = pd.DataFrame({'country': ['US', None, 'CN', 'FR']})
+    data = FeatureEngineer.create_high_risk_country_flag(data, 'country', ['CN', 'US'])
+    assert data['high_risk_country'].dtype == np.uint8
+    assert data['high_risk_country'].tolist() == [1, 0, 1, 0]
+
+
+def test_high_risk_flag_with_categorical_column():
+    countries = pd.Categorical(['US', None, 'CN', 'FR'], categories=['CN', 'FR', 'US'])
+    data = FeatureEngineer.create_high_risk_country_flag(pd.DataFrame({'country': countries}), 'country', ['CN', 'US'])
+    assert data['high_risk_country'].tolist() == [1, 0, 1, 0]
+
+
+def test_high_risk_flag_with_all_missing_categorical_column():
+    countries = pd.Categorical([None, None])
+    data = FeatureEngineer.create_high_risk_country_flag(pd.DataFrame({'country': countries}), 'country', ['CN'])
+    assert data['high_risk_country'].tolist() == [0, 0]
+
+
+def test_transaction_features_match_groupby_transforms(transactions):
+    transactions = transactions.sample(frac=1, random_state=0)
+    transactions['purchase_time'] = transactions['purchase_time'].astype(str)
+    expected = transform_transaction_features(
+        transactions.assign(purchase_time=pd.to_datetime(transactions['purchase_time'])), 'user_id', 'purchase_time'
+    )
+    result = FeatureEngineer.create_transaction_features(transactions.copy(), 'user_id', 'purchase_time')
+
+    assert pd.api.types.is_datetime64_any_dtype(result['purchase_time'])
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_transaction_features_polars_matches_pandas(transactions):
+    pytest.importorskip('polars')
+    transactions.index = transactions.index * 3
+    expected = FeatureEngineer.create_transaction_features(transactions.copy(), 'user_id', 'purchase_time')
+    result = FeatureEngineer.create_transaction_features_pl(transactions.copy(), 'user_id', 'purchase_time')
+
+    pd.testing.assert_index_equal(result.index, expected.index)
+    for col in ['transaction_count', 'days_since_first_transaction', 'transaction_velocity']:
+        np.testing.assert_allclose(result[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float))
+
+
+def categorical_transactions():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'purchase_value': rng.uniform(0, 100, size=60),
+        'source': rng.choice(['SEO', 'Ads', 'Direct'], size=60),
+        'browser': rng.choice(['Chrome', 'Safari'], size=60),
+    })
+
+
+def test_encode_categorical_features_matches_one_hot_encoder():
+    from sklearn.preprocessing import OneHotEncoder
+
+    data = categorical_transactions()
+    encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+    expected = encoder.fit_transform(data[['source', 'browser']])
+    names = encoder.get_feature_names_out(['source', 'browser'])
+
+    result = FeatureEngineer.encode_categorical_features(data.copy(), ['source', 'browser'])
+    assert 'source' not in result.columns and 'browser' not in result.columns
+    assert all(result[name].dtype == pd.SparseDtype(np.uint8, 0) for name in names)
+    np.testing.assert_array_equal(result[list(names)].sparse.to_dense().to_numpy(), expected)
+
+
+def test_encode_categorical_features_updates_the_frame_in_place():
+    data = categorical_transactions()
+    data.index = data.index + 100
+    values = data['purchase_value'].copy()
+
+    result = FeatureEngineer.encode_categorical_features(data, ['source'])
+    assert result is data
+    # The original index is kept (the old path reset it) and other columns are untouched
+    pd.testing.assert_series_equal(result['purchase_value'], values)
+    assert list(result.columns) == ['purchase_value', 'browser', 'source_Ads', 'source_Direct', 'source_SEO']
+
+
+def assert_matches_dt_accessors(data, times):
+    expected_hour = times.dt.hour.astype('Int64')
+    expected_day = times.dt.dayofweek.astype('Int64')
+    pd.testing.assert_series_equal(data['hour_of_day'].astype('Int64'), expected_hour, check_names=False)
+    pd.testing.assert_series_equal(data['day_of_week'].astype('Int64'), expected_day, check_names=False)
+
+
+def test_time_features_match_dt_accessors(transactions):
+    data = FeatureEngineer.create_time_features(transactions.copy(), 'purchase_time')
+    assert_matches_dt_accessors(data, transactions['purchase_time'])
+
+
+def test_time_features_with_missing_times(transactions):
+    transactions.loc[::7, 'purchase_time'] = pd.NaT
+    data = FeatureEngineer.create_time_features(transactions.copy(), 'purchase_time')
+    assert_matches_dt_accessors(data, transactions['purchase_time'])
+
+
+def test_time_features_use_local_time_for_tz_aware_columns(transactions):
+    times = transactions['purchase_time'].dt.tz_localize('US/Eastern', nonexistent='shift_forward')
+    data = FeatureEngineer.create_time_features(pd.DataFrame({'purchase_time': times}), 'purchase_time')
+    assert_matches_dt_accessors(data, times)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.geolocation_analysis as geolocation_analysis
+from scripts.geolocation_analysis import GeolocationAnalyzer
+
+
+@pytest.fixture
+def ip_data():
+    rng = np.random.default_rng(0)
+    lower = np.sort(rng.choice(2**32 - 1000, size=500, replace=False))
+    # Ranges of random width, leaving gaps between some of them
+    upper = np.minimum(lower + rng.integers(0, 1000, size=500), np.r_[lower[1:] - 1, 2**32 - 1])
+    return pd.DataFrame({
+        'lower_bound_ip_address': lower.astype(float),
+        'upper_bound_ip_address': upper,
+        'country': [f'C{i}' for i in range(500)],
+    }).sample(frac=1, random_state=0)
+
+
+@pytest.fixture
+def fraud_data(ip_data):
+    rng = np.random.default_rng(1)
+    # Mix of addresses inside known ranges, random ones, and invalid ones
+    inside = ip_data['lower_bound_ip_address'].to_numpy()[:200] + 0.5
+    ips = np.r_[inside, rng.uniform(0, 2**32, size=200), [np.nan, -1.0, 2**32 + 1.0]]
+    return pd.DataFrame({'ip_address': ips}, index=np.arange(len(ips)) * 2)
+
+
+def test_ips_to_int_dotted_strings():
+    ips = pd.Series(['0.0.0.0', '1.2.3.4', '255.255.255.255'])
+    result = GeolocationAnalyzer.ips_to_int(ips)
+    np.testing.assert_array_equal(result.to_numpy(), [0.0, 16909060.0, 2.0**32 - 1])
+
+
+def test_ips_to_int_marks_malformed_rows_individually():
+    ips = pd.Series(['1.2.3.4', '10.0.0.1', '1.2.3.4.5', '1.2.3', None, '256.0.0.1', 'a.b.c.d'])
+    result = GeolocationAnalyzer.ips_to_int(ips)
+    expected = [16909060.0, 167772161.0] + [np.nan] * 5
+    np.testing.assert_array_equal(result.to_numpy(), expected)
+
+
+def test_ips_to_int_all_missing():
+    assert GeolocationAnalyzer.ips_to_int(pd.Series([None, None])).isna().all()
+
+
+def test_ips_to_int_numeric():
+    result = GeolocationAnalyzer.ips_to_int(pd.Series([732758368.79, -1.0, 2.0**32, np.nan]))
+    np.testing.assert_array_equal(result.to_numpy(), [732758368.0, np.nan, np.nan, np.nan])
+
+
+def test_merge_matches_brute_force_range_search(ip_data, fraud_data):
+    merged = GeolocationAnalyzer.merge_fraud_with_geolocation(fraud_data.copy(), ip_data)
+
+    lower = ip_data['lower_bound_ip_address'].to_numpy()
+    upper = ip_data['upper_bound_ip_address'].to_numpy()
+    expected = []
+    for ip in merged['ip_int']:
+        match = np.flatnonzero((lower <= ip) & (ip <= upper))
+        expected.append(ip_data['country'].iloc[match[0]] if len(match) else None)
+
+    assert list(merged.index) == list(fraud_data.index[:-3])
+    assert merged['country'].isna().tolist() == [country is None for country in expected]
+    assert merged['country'].dropna().tolist() == [country for country in expected if country is not None]
+
+
+def test_interval_lookup_empty_table():
+    empty = np.array([], dtype=np.int64)
+    result = GeolocationAnalyzer._interval_lookup(np.array([1, 2, 3]), empty, empty)
+    np.testing.assert_array_equal(result, [-1, -1, -1])
+
+
+def test_merge_with_empty_table_adds_country_column(fraud_data):
+    ip_data = pd.DataFrame({'lower_bound_ip_address': [], 'upper_bound_ip_address': [], 'country': []})
+    merged = GeolocationAnalyzer.merge_fraud_with_geolocation(fraud_data.copy(), ip_data)
+    assert len(merged) == len(fraud_data) - 3
+    assert merged['country'].isna().all()
+
+
+def test_merge_polars_matches_pandas(ip_data, fraud_data):
+    pytest.importorskip('polars')
+    expected = GeolocationAnalyzer.merge_fraud_with_geolocation(fraud_data.copy(), ip_data)
+    result = GeolocationAnalyzer.merge_fraud_with_geolocation_pl(fraud_data.copy(), ip_data)
+
+    pd.testing.assert_index_equal(result.index, expected.index)
+    np.testing.assert_array_equal(result['ip_int'].to_numpy(dtype=np.int64), expected['ip_int'].to_numpy())
+    # Missing countries are None in the pandas result and null in the Arrow-backed one
+    assert result['country'].isna().tolist() == expected['country'].isna().tolist()
+    assert result['country'].dropna().tolist() == expected['country'].dropna().tolist()
+
+
+def test_interval_lookup_numba_matches_searchsorted(ip_data, fraud_data, monkeypatch):
+    if geolocation_analysis._interval_lookup_kernel is None:
+        pytest.skip("numba is not installed")
+    analyzer = GeolocationAnalyzer(ip_data)
+    ip_ints = GeolocationAnalyzer.ips_to_int(fraud_data['ip_address']).dropna().to_numpy(dtype=np.int64)
+
+    monkeypatch.setattr(geolocation_analysis, 'NUMBA_MIN_RANGES', np.inf)
+    expected = GeolocationAnalyzer._interval_lookup(ip_ints, analyzer.lower_bounds, analyzer.upper_bounds)
+    # Lower the threshold so the compiled kernel handles this small table
+    monkeypatch.setattr(geolocation_analysis, 'NUMBA_MIN_RANGES', 0)
+    result = GeolocationAnalyzer._interval_lookup(ip_ints, analyzer.lower_bounds, analyzer.upper_bounds)
+
+    np.testing.assert_array_equal(result, expected)
+    assert (expected >= 0).sum() >= 200